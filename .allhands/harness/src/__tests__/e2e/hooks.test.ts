@@ -7,6 +7,8 @@
  */
 
 import { describe, it, expect, beforeAll, afterAll } from 'vitest';
+import { spawnSync } from 'child_process';
+import { join } from 'path';
 import {
   createFixture,
   createMilestoneFixture,
@@ -19,6 +21,7 @@ import {
   testHookContracts,
   assertHookAllowed,
   assertHookDenied,
+  assertDenialReasonContains,
   assertHookInjectedContext,
   assertHookContextContains,
   assertContractsPassed,
@@ -28,6 +31,9 @@ import {
   TYPESCRIPT_SAMPLE,
 } from '../harness/index.js';
 
+/** The `ah` entry script (answers some hooks itself before starting Node) */
+const AH_SCRIPT = join(__dirname, '..', '..', '..', 'ah');
+
 // ─────────────────────────────────────────────────────────────────────────────
 // Test Setup
 // ─────────────────────────────────────────────────────────────────────────────
@@ -225,6 +231,38 @@ status: pending
     });
   });
 
+  // ───────────────────────────────────────────────────────────────────────────
+  // Enforcement Hooks
+  // ───────────────────────────────────────────────────────────────────────────
+
+  describe('enforcement hooks', () => {
+    describe('research-search', () => {
+      const input = {
+        tool_name: 'WebSearch',
+        tool_input: { query: 'vitest fake timers' },
+      };
+
+      it('denies WebSearch and suggests perplexity research', async () => {
+        const result = await runHook('enforcement', 'research-search', input, fixture);
+        assertDenialReasonContains(result, 'ah perplexity research');
+      });
+
+      it('ah script fast path emits the same output as the TypeScript hook', async () => {
+        const result = await runHook('enforcement', 'research-search', input, fixture);
+        assertHookDenied(result);
+
+        const script = spawnSync(
+          'bash',
+          [AH_SCRIPT, 'hooks', 'enforcement', 'research-search'],
+          { input: JSON.stringify(input), encoding: 'utf-8' }
+        );
+
+        expect(script.status).toBe(0);
+        expect(JSON.parse(script.stdout)).toEqual(result.hookOutput);
+      });
+    });
+  });
+
   // ───────────────────────────────────────────────────────────────────────────
   // Contract Testing
   // ───────────────────────────────────────────────────────────────────────────
@@ -7,10 +7,23 @@
  * Commands:
  * - ah perplexity research <query> - Web search with citations
  *   --challenge: Challenge findings using Grok X/Twitter search
+ *   --no-cache: Skip the exact/semantic response cache
+ *
+ * Set PERPLEXITY_SEMANTIC_CACHE=1 to also reuse answers for near-identical
+ * queries, and XAI_CACHE=1 to cache identical Grok challenge requests on disk.
  */
 
 import { Command } from 'commander';
 import { tracedAction } from '../lib/base-command.js';
+import { postEventStream, postJson } from '../lib/http.js';
+import {
+  ResearchCache,
+  hashKey,
+  readCachedResponse,
+  writeCachedResponse,
+  type CacheHit,
+  type CachedResearch,
+} from '../lib/research-cache.js';
 
 interface PerplexityResponse {
   choices?: Array<{
@@ -21,6 +34,16 @@ interface PerplexityResponse {
   citations?: string[];
 }
 
+/** One server-sent event of a streamed sonar-pro completion */
+interface PerplexityStreamChunk {
+  choices?: Array<{
+    delta?: {
+      content?: string;
+    };
+  }>;
+  citations?: string[];
+}
+
 interface GrokResponse {
   choices?: Array<{
     message?: {
@@ -40,10 +63,31 @@ const GROK_CHALLENGER_PROMPT = `You are a critical research challenger. Given re
 
 Be skeptical. Surface what the research missed or got wrong. Focus on recent posts (last 6 months).`;
 
+const GROK_MODEL = 'grok-4-1-fast';
+
+/**
+ * Constant head of every challenge request body (model + system message),
+ * serialized once; each call only encodes the user message.
+ */
+const GROK_BODY_PREFIX =
+  `{"model":${JSON.stringify(GROK_MODEL)},"messages":[` +
+  `${JSON.stringify({ role: 'system', content: GROK_CHALLENGER_PROMPT })},`;
+
+/** Constant head of every research request body (streamed) */
+const PERPLEXITY_BODY_PREFIX = '{"model":"sonar-pro","stream":true,"messages":[';
+
 const GROK_TIMEOUT = 120000;
 
+const GROK_CACHE_ENABLED = process.env.XAI_CACHE === '1';
+
+const GROK_CACHE_TTL = parseInt(process.env.XAI_CACHE_TTL_MS ?? '86400000', 10);
+
 const PERPLEXITY_TIMEOUT = parseInt(process.env.PERPLEXITY_TIMEOUT_MS ?? '60000', 10);
 
+const PERPLEXITY_CACHE_TTL = parseInt(process.env.PERPLEXITY_CACHE_TTL_MS ?? '86400000', 10);
+
+const PERPLEXITY_SEMANTIC_CACHE = process.env.PERPLEXITY_SEMANTIC_CACHE === '1';
+
 export function register(program: Command): void {
   const perplexity = program
     .command('perplexity')
@@ -55,7 +99,8 @@ export function register(program: Command): void {
     .description('Web search with citations (sonar-pro model)')
     .option('--json', 'Output as JSON')
     .option('--challenge', 'Challenge findings using Grok X/Twitter search')
-    .action(tracedAction('perplexity research', async (query: string, options: { json?: boolean; challenge?: boolean }) => {
+    .option('--no-cache', 'Bypass cached answers for identical or near-identical queries')
+    .action(tracedAction('perplexity research', async (query: string, options: { json?: boolean; challenge?: boolean; cache?: boolean }) => {
       const apiKey = process.env.PERPLEXITY_API_KEY;
       if (!apiKey) {
         if (options.json) {
@@ -66,27 +111,53 @@ export function register(program: Command): void {
         process.exit(1);
       }
 
+      // Resolve the challenger key up front so a missing key fails before
+      // the (slow) Perplexity call rather than after it
+      const grokApiKey = process.env.X_AI_API_KEY;
+      if (options.challenge && !grokApiKey) {
+        if (options.json) {
+          console.log(JSON.stringify({ success: false, error: 'X_AI_API_KEY not set (required for --challenge)' }));
+        } else {
+          console.error('Error: X_AI_API_KEY not set in environment (required for --challenge)');
+        }
+        process.exit(1);
+      }
+
       try {
-        const response = await callPerplexityApi(apiKey, query);
+        // The cache is best-effort: an unusable cache directory means no cache,
+        // never a failed research call
+        let cache: ResearchCache | null = null;
+        let cacheHit: CacheHit | null = null;
+        if (options.cache !== false) {
+          try {
+            cache = new ResearchCache('perplexity', PERPLEXITY_CACHE_TTL, {
+              semantic: PERPLEXITY_SEMANTIC_CACHE,
+            });
+            cacheHit = await cache.lookup(query);
+          } catch {
+            cache = null;
+          }
+        }
 
-        const content = response.choices?.[0]?.message?.content ?? '';
-        const citations = response.citations ?? [];
+        let content: string;
+        let citations: string[];
+        if (cacheHit) {
+          content = cacheHit.content;
+          citations = cacheHit.citations;
+        } else {
+          const response = await callPerplexityApi(apiKey, query);
+          content = response.choices?.[0]?.message?.content ?? '';
+          citations = response.citations ?? [];
+        }
+        // Stored only after the answer is printed, so the user never waits on it
+        const cacheToFill = cache && !cacheHit && content ? cache : null;
 
-        // If --challenge flag, use Grok to challenge the findings
+        // If --challenge flag, use Grok to challenge the findings.
+        // The challenger consumes Perplexity's findings, so it runs after them.
         let challengeContent: string | undefined;
         let challengeCitations: string[] | undefined;
 
-        if (options.challenge) {
-          const grokApiKey = process.env.X_AI_API_KEY;
-          if (!grokApiKey) {
-            if (options.json) {
-              console.log(JSON.stringify({ success: false, error: 'X_AI_API_KEY not set (required for --challenge)' }));
-            } else {
-              console.error('Error: X_AI_API_KEY not set in environment (required for --challenge)');
-            }
-            process.exit(1);
-          }
-
+        if (options.challenge && grokApiKey) {
           const grokResponse = await callGrokChallengeApi(grokApiKey, query, content);
           challengeContent = grokResponse.choices?.[0]?.message?.content ?? '';
           challengeCitations = grokResponse.citations ?? [];
@@ -99,6 +170,14 @@ export function register(program: Command): void {
             content,
             citations,
           };
+          if (cacheHit) {
+            result.cache = {
+              type: cacheHit.type,
+              cached_query: cacheHit.cachedQuery,
+              similarity: cacheHit.similarity,
+              cached_at: cacheHit.cachedAt,
+            };
+          }
           if (options.challenge) {
             result.challenge = {
               content: challengeContent,
@@ -106,10 +185,14 @@ export function register(program: Command): void {
             };
           }
           console.log(JSON.stringify(result, null, 2));
+          if (cacheToFill) await storeResearch(cacheToFill, query, { content, citations });
           return;
         }
 
         console.log('Research Results:');
+        if (cacheHit) {
+          console.log(`(cached ${cacheHit.cachedAt} for "${cacheHit.cachedQuery}")`);
+        }
         console.log();
         console.log(content);
 
@@ -137,6 +220,8 @@ export function register(program: Command): void {
             }
           }
         }
+
+        if (cacheToFill) await storeResearch(cacheToFill, query, { content, citations });
       } catch (e) {
         const error = e instanceof Error ? e.message : String(e);
         if (options.json) {
@@ -149,32 +234,46 @@ export function register(program: Command): void {
     }));
 }
 
+/**
+ * Store a fresh answer, ignoring cache failures (read-only or full disk).
+ */
+async function storeResearch(cache: ResearchCache, query: string, research: CachedResearch): Promise<void> {
+  try {
+    await cache.store(query, research);
+  } catch {
+    // Best-effort: the answer has already been printed
+  }
+}
+
+/**
+ * Stream a sonar-pro completion and assemble it into a response.
+ *
+ * Deltas are collected as they arrive and joined once at the end, so the
+ * timeout only trips when the stream stalls rather than on long answers.
+ */
 async function callPerplexityApi(apiKey: string, query: string): Promise<PerplexityResponse> {
-  const controller = new AbortController();
-  const timeout = setTimeout(() => controller.abort(), PERPLEXITY_TIMEOUT);
+  const parts: string[] = [];
+  let citations: string[] | undefined;
 
-  try {
-    const response = await fetch('https://api.perplexity.ai/chat/completions', {
-      method: 'POST',
-      headers: {
-        Authorization: `Bearer ${apiKey}`,
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        model: 'sonar-pro',
-        messages: [{ role: 'user', content: query }],
-      }),
-      signal: controller.signal,
-    });
-
-    if (!response.ok) {
-      throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+  await postEventStream(
+    'https://api.perplexity.ai/chat/completions',
+    {
+      apiKey,
+      body: `${PERPLEXITY_BODY_PREFIX}${JSON.stringify({ role: 'user', content: query })}]}`,
+      timeoutMs: PERPLEXITY_TIMEOUT,
+    },
+    (data) => {
+      const chunk = JSON.parse(data) as PerplexityStreamChunk;
+      const delta = chunk.choices?.[0]?.delta?.content;
+      if (delta) parts.push(delta);
+      if (chunk.citations) citations = chunk.citations;
     }
+  );
 
-    return (await response.json()) as PerplexityResponse;
-  } finally {
-    clearTimeout(timeout);
-  }
+  return {
+    choices: [{ message: { content: parts.join('') } }],
+    citations,
+  };
 }
 
 async function callGrokChallengeApi(
@@ -182,9 +281,6 @@ async function callGrokChallengeApi(
   query: string,
   findings: string
 ): Promise<GrokResponse> {
-  const controller = new AbortController();
-  const timeout = setTimeout(() => controller.abort(), GROK_TIMEOUT);
-
   const userPrompt = `Original query: ${query}
 
 Research findings to challenge:
@@ -192,29 +288,35 @@ ${findings}
 
 Search X to challenge these findings.`;
 
-  try {
-    const response = await fetch('https://api.x.ai/v1/chat/completions', {
-      method: 'POST',
-      headers: {
-        Authorization: `Bearer ${apiKey}`,
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        model: 'grok-4-1-fast',
-        messages: [
-          { role: 'system', content: GROK_CHALLENGER_PROMPT },
-          { role: 'user', content: userPrompt },
-        ],
-      }),
-      signal: controller.signal,
-    });
-
-    if (!response.ok) {
-      throw new Error(`HTTP ${response.status}: ${await response.text()}`);
+  const body = `${GROK_BODY_PREFIX}${JSON.stringify({ role: 'user', content: userPrompt })}]}`;
+
+  // Opt-in: identical prompts are common in dev loops, but live X search
+  // results drift, so callers wanting fresh sentiment leave this off.
+  // The body covers model, system and user prompt, so it doubles as the key.
+  // Cache errors (unwritable or full cache dir) are ignored: the cache is an
+  // optimization and must not fail a challenge run.
+  const cacheKey = GROK_CACHE_ENABLED ? hashKey(body) : null;
+  if (cacheKey) {
+    try {
+      const cached = readCachedResponse<GrokResponse>('xai', cacheKey, GROK_CACHE_TTL);
+      if (cached) return cached;
+    } catch {
+      // Treat as a miss
     }
+  }
+
+  const response = await postJson<GrokResponse>('https://api.x.ai/v1/chat/completions', {
+    apiKey,
+    body,
+    timeoutMs: GROK_TIMEOUT,
+  });
 
-    return (await response.json()) as GrokResponse;
-  } finally {
-    clearTimeout(timeout);
+  if (cacheKey) {
+    try {
+      writeCachedResponse('xai', cacheKey, response);
+    } catch {
+      // Best-effort
+    }
   }
+  return response;
 }
@@ -10,6 +10,7 @@
 
 import { Command } from 'commander';
 import { existsSync, readdirSync, readFileSync, statSync } from 'fs';
+import { readdir, readFile } from 'fs/promises';
 import { join, dirname } from 'path';
 import { fileURLToPath } from 'url';
 import { parse as parseYaml } from 'yaml';
@@ -41,6 +42,12 @@ interface SkillMatch extends SkillEntry {
   pathMatch: boolean;
 }
 
+/** YAML frontmatter block at the start of a markdown file (captures the YAML). */
+const FRONTMATTER_PATTERN = /^---\n([\s\S]*?)\n---/;
+
+/** Frontmatter block including its trailing newline, for stripping. */
+const FRONTMATTER_BLOCK_PATTERN = /^---\n[\s\S]*?\n---\n?/;
+
 /** Scoring weights for keyword matching against skill fields. */
 const SCORE_WEIGHT = {
   NAME: 3,
@@ -64,8 +71,7 @@ const getProjectRoot = (): string => {
  * Extract frontmatter from markdown content
  */
 function extractFrontmatter(content: string): Record<string, unknown> | null {
-  const frontmatterRegex = /^---\n([\s\S]*?)\n---/;
-  const match = content.match(frontmatterRegex);
+  const match = content.match(FRONTMATTER_PATTERN);
 
   if (!match) {
     return null;
@@ -82,8 +88,7 @@ function extractFrontmatter(content: string): Record<string, unknown> | null {
  * Extract body content from markdown (everything after frontmatter)
  */
 function extractBody(content: string): string {
-  const frontmatterRegex = /^---\n[\s\S]*?\n---\n?/;
-  return content.replace(frontmatterRegex, '').trim();
+  return content.replace(FRONTMATTER_BLOCK_PATTERN, '').trim();
 }
 
 /**
@@ -95,43 +100,46 @@ function getSkillsDir(): string {
 }
 
 /**
- * List all skills by reading SKILL.md files and extracting frontmatter
+ * List all skills by reading SKILL.md files and extracting frontmatter.
+ * Skill files are read concurrently; results keep directory order.
  */
-function listSkills(): SkillEntry[] {
+async function listSkills(): Promise<SkillEntry[]> {
   const dir = getSkillsDir();
 
   if (!existsSync(dir)) {
     return [];
   }
 
-  const entries = readdirSync(dir);
-  const skills: SkillEntry[] = [];
-
-  for (const entry of entries) {
-    const entryPath = join(dir, entry);
-    const stat = statSync(entryPath);
-
-    // Skip non-directories
-    if (!stat.isDirectory()) continue;
-
-    // Look for SKILL.md in the directory
-    const skillFile = join(entryPath, 'SKILL.md');
-    if (!existsSync(skillFile)) continue;
-
-    const content = readFileSync(skillFile, 'utf-8');
-    const frontmatter = extractFrontmatter(content) as SkillFrontmatter | null;
-
-    if (frontmatter && frontmatter.name && frontmatter.description && frontmatter.globs) {
-      skills.push({
-        name: frontmatter.name,
-        description: frontmatter.description,
-        globs: frontmatter.globs,
-        file: `.allhands/skills/${entry}/SKILL.md`,
-      });
-    }
-  }
-
-  return skills;
+  const entries = await readdir(dir, { withFileTypes: true });
+
+  const loaded = await Promise.all(
+    entries
+      // Skip non-directories (symlinks are resolved by the read below)
+      .filter((entry) => entry.isDirectory() || entry.isSymbolicLink())
+      .map(async (entry): Promise<SkillEntry | null> => {
+        // Look for SKILL.md in the directory
+        let content: string;
+        try {
+          content = await readFile(join(dir, entry.name, 'SKILL.md'), 'utf-8');
+        } catch {
+          return null;
+        }
+
+        const frontmatter = extractFrontmatter(content) as SkillFrontmatter | null;
+        if (!frontmatter || !frontmatter.name || !frontmatter.description || !frontmatter.globs) {
+          return null;
+        }
+
+        return {
+          name: frontmatter.name,
+          description: frontmatter.description,
+          globs: frontmatter.globs,
+          file: `.allhands/skills/${entry.name}/SKILL.md`,
+        };
+      })
+  );
+
+  return loaded.filter((skill): skill is SkillEntry => skill !== null);
 }
 
 /**
@@ -207,12 +215,12 @@ function matchesPaths(skill: SkillEntry, paths: string[]): boolean {
 /**
  * Search skills by keyword scoring with optional path boosting.
  */
-function searchSkills(
+async function searchSkills(
   query: string,
   options: { paths?: string[]; limit?: number },
-): SkillMatch[] {
+): Promise<SkillMatch[]> {
   const { paths, limit = 10 } = options;
-  const allSkills = listSkills();
+  const allSkills = await listSkills();
   const keywords = extractKeywords(query);
   const results: SkillMatch[] = [];
 
@@ -380,7 +388,7 @@ export function register(program: Command): void {
         return;
       }
 
-      const matches = searchSkills(query, { paths, limit });
+      const matches = await searchSkills(query, { paths, limit });
 
       if (matches.length === 0) {
         console.log(JSON.stringify({
@@ -24,6 +24,12 @@ const __dirname = dirname(__filename);
 
 const AGGREGATOR_PROMPT_PATH = join(__dirname, '../lib/opencode/prompts/solutions-aggregator.md');
 
+/** Captures the YAML between a solution file's leading --- fences */
+const FRONTMATTER_PATTERN = /^---\n([\s\S]*?)\n---/;
+
+/** Whole frontmatter block, stripped when returning solution content */
+const FRONTMATTER_BLOCK_PATTERN = /^---\n[\s\S]*?\n---\n/;
+
 const getAggregatorPrompt = (): string => {
   return readFileSync(AGGREGATOR_PROMPT_PATH, 'utf-8');
 };
@@ -96,7 +102,7 @@ function extractKeywords(query: string): string[] {
 function parseFrontmatter(filePath: string): SolutionFrontmatter | null {
   try {
     const content = readFileSync(filePath, 'utf-8');
-    const fmMatch = content.match(/^---\n([\s\S]*?)\n---/);
+    const fmMatch = content.match(FRONTMATTER_PATTERN);
     if (!fmMatch) return null;
 
     const parsed = parse(fmMatch[1]) as SolutionFrontmatter;
@@ -223,7 +229,7 @@ function getSolutionContent(filePath: string): string | null {
     const fullPath = filePath.startsWith('/') ? filePath : join(getProjectRoot(), filePath);
     const content = readFileSync(fullPath, 'utf-8');
     // Remove frontmatter
-    return content.replace(/^---\n[\s\S]*?\n---\n/, '').trim();
+    return content.replace(FRONTMATTER_BLOCK_PATTERN, '').trim();
   } catch {
     return null;
   }
@@ -106,6 +106,9 @@ const HOOK_RESEARCH_SEARCH = 'enforcement research-search';
  * Block WebSearch and suggest research delegation.
  *
  * Triggered by: PreToolUse matcher "WebSearch"
+ *
+ * The `ah` entry script answers this hook with a static copy of this output
+ * before starting Node; update both together (hooks.test.ts compares them).
  */
 export function enforceResearchSearch(_input: HookInput): void {
   denyTool(
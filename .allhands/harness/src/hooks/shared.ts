@@ -74,15 +74,17 @@ export interface PreCompactOutput {
  */
 export async function readHookInput(): Promise<HookInput> {
   return new Promise((resolve, reject) => {
-    let data = '';
-    process.stdin.setEncoding('utf8');
+    // Collect raw chunks and decode once at the end (no per-chunk decoding
+    // or string re-concatenation for large tool_response payloads)
+    const chunks: Buffer[] = [];
 
-    process.stdin.on('data', (chunk) => {
-      data += chunk;
+    process.stdin.on('data', (chunk: Buffer) => {
+      chunks.push(chunk);
     });
 
     process.stdin.on('end', () => {
       try {
+        const data = Buffer.concat(chunks).toString('utf8');
         if (!data.trim()) {
           resolve({});
           return;
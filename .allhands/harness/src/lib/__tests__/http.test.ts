@@ -0,0 +1,360 @@
+/**
+ * Tests for the shared research API HTTP client
+ */
+
+import { describe, expect, it, vi, beforeEach, afterEach } from 'vitest';
+import { postEventStream, postJson } from '../http.js';
+
+const API_URL = 'https://api.example.test/chat/completions';
+const OPTIONS = { apiKey: 'test-key', body: { query: 'q' }, timeoutMs: 5000 };
+
+function jsonResponse(status: number, body: unknown, headers: Record<string, string> = {}): Response {
+  return new Response(JSON.stringify(body), { status, headers });
+}
+
+/** A fetch that never settles on its own and rejects like undici when aborted */
+function hangingFetch(_url: string, init: RequestInit): Promise<Response> {
+  return new Promise((_resolve, reject) => {
+    init.signal?.addEventListener('abort', () => {
+      reject(new DOMException('This operation was aborted', 'AbortError'));
+    });
+  });
+}
+
+/**
+ * An SSE response whose body the test feeds by hand. Like undici, aborting
+ * the request signal errors the body stream.
+ */
+function eventStream() {
+  const encoder = new TextEncoder();
+  const cancel = vi.fn();
+  let controller!: ReadableStreamDefaultController<Uint8Array>;
+  const body = new ReadableStream<Uint8Array>({
+    start(c) {
+      controller = c;
+    },
+    cancel,
+  });
+
+  return {
+    cancel,
+    fetch: async (_url: string, init: RequestInit): Promise<Response> => {
+      init.signal?.addEventListener('abort', () => {
+        controller.error(new DOMException('This operation was aborted', 'AbortError'));
+      });
+      return { ok: true, status: 200, headers: new Headers(), body } as unknown as Response;
+    },
+    push: (chunk: string | Uint8Array) => {
+      controller.enqueue(typeof chunk === 'string' ? encoder.encode(chunk) : chunk);
+    },
+    close: () => controller.close(),
+  };
+}
+
+describe('postJson', () => {
+  const fetchMock = vi.fn();
+
+  beforeEach(() => {
+    vi.useFakeTimers({ toFake: ['setTimeout', 'clearTimeout', 'Date'] });
+    // No jitter: backoff is exactly 1s, 2s, 4s, 8s
+    vi.spyOn(Math, 'random').mockReturnValue(0);
+    vi.stubGlobal('fetch', fetchMock);
+  });
+
+  afterEach(() => {
+    fetchMock.mockReset();
+    vi.unstubAllGlobals();
+    vi.restoreAllMocks();
+    vi.useRealTimers();
+  });
+
+  it('posts JSON with bearer auth and parses the response', async () => {
+    fetchMock.mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+
+    await expect(postJson(API_URL, OPTIONS)).resolves.toEqual({ ok: true });
+
+    const [url, init] = fetchMock.mock.calls[0];
+    expect(url).toBe(API_URL);
+    expect(init).toMatchObject({
+      method: 'POST',
+      body: '{"query":"q"}',
+      headers: {
+        'Content-Type': 'application/json',
+        Authorization: 'Bearer test-key',
+      },
+    });
+  });
+
+  it('sends a pre-serialized string body unchanged', async () => {
+    fetchMock.mockResolvedValueOnce(jsonResponse(200, {}));
+
+    await postJson(API_URL, { ...OPTIONS, body: '{"raw":1}' });
+
+    expect(fetchMock.mock.calls[0][1].body).toBe('{"raw":1}');
+  });
+
+  it.each([429, 500, 502, 503, 504])('retries HTTP %i after backoff', async (status) => {
+    fetchMock
+      .mockResolvedValueOnce(jsonResponse(status, { error: 'busy' }))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+
+    const promise = postJson(API_URL, OPTIONS);
+    await vi.advanceTimersByTimeAsync(999);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    await vi.advanceTimersByTimeAsync(1);
+
+    await expect(promise).resolves.toEqual({ ok: true });
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it.each([400, 401, 403, 404, 422])('does not retry HTTP %i', async (status) => {
+    fetchMock.mockResolvedValueOnce(jsonResponse(status, { error: 'nope' }));
+
+    await expect(postJson(API_URL, OPTIONS)).rejects.toThrow(`HTTP ${status}: {"error":"nope"}`);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+
+  it('waits for Retry-After given in seconds', async () => {
+    fetchMock
+      .mockResolvedValueOnce(jsonResponse(429, {}, { 'Retry-After': '3' }))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+
+    const promise = postJson(API_URL, OPTIONS);
+    await vi.advanceTimersByTimeAsync(2999);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    await vi.advanceTimersByTimeAsync(1);
+
+    await expect(promise).resolves.toEqual({ ok: true });
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it('waits for Retry-After given as an HTTP-date', async () => {
+    vi.setSystemTime(new Date('2026-01-01T00:00:00Z'));
+    const retryAt = new Date('2026-01-01T00:00:05Z').toUTCString();
+    fetchMock
+      .mockResolvedValueOnce(jsonResponse(503, {}, { 'Retry-After': retryAt }))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+
+    const promise = postJson(API_URL, OPTIONS);
+    await vi.advanceTimersByTimeAsync(4999);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    await vi.advanceTimersByTimeAsync(1);
+
+    await expect(promise).resolves.toEqual({ ok: true });
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it('caps Retry-After at 60 seconds', async () => {
+    fetchMock
+      .mockResolvedValueOnce(jsonResponse(429, {}, { 'Retry-After': '3600' }))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+
+    const promise = postJson(API_URL, OPTIONS);
+    await vi.advanceTimersByTimeAsync(59999);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    await vi.advanceTimersByTimeAsync(1);
+
+    await expect(promise).resolves.toEqual({ ok: true });
+  });
+
+  it('falls back to backoff for an unparseable Retry-After', async () => {
+    fetchMock
+      .mockResolvedValueOnce(jsonResponse(429, {}, { 'Retry-After': 'soon' }))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+
+    const promise = postJson(API_URL, OPTIONS);
+    await vi.advanceTimersByTimeAsync(1000);
+
+    await expect(promise).resolves.toEqual({ ok: true });
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it('retries connection errors', async () => {
+    fetchMock
+      .mockRejectedValueOnce(new TypeError('fetch failed'))
+      .mockResolvedValueOnce(jsonResponse(200, { ok: true }));
+
+    const promise = postJson(API_URL, OPTIONS);
+    await vi.advanceTimersByTimeAsync(1000);
+
+    await expect(promise).resolves.toEqual({ ok: true });
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it('does not retry timeouts', async () => {
+    fetchMock.mockImplementation(hangingFetch);
+
+    const assertion = expect(postJson(API_URL, OPTIONS)).rejects.toThrow(
+      'Request timed out after 5000ms'
+    );
+    await vi.advanceTimersByTimeAsync(5000);
+
+    await assertion;
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+
+  it('gives up after MAX_RETRIES retries', async () => {
+    fetchMock.mockImplementation(async () => jsonResponse(503, { error: 'busy' }));
+
+    const assertion = expect(postJson(API_URL, OPTIONS)).rejects.toThrow('HTTP 503');
+    await vi.advanceTimersByTimeAsync(1000 + 2000 + 4000 + 8000);
+
+    await assertion;
+    expect(fetchMock).toHaveBeenCalledTimes(5);
+  });
+
+  it('rethrows the connection error after MAX_RETRIES retries', async () => {
+    fetchMock.mockRejectedValue(new TypeError('fetch failed'));
+
+    const assertion = expect(postJson(API_URL, OPTIONS)).rejects.toThrow('fetch failed');
+    await vi.advanceTimersByTimeAsync(1000 + 2000 + 4000 + 8000);
+
+    await assertion;
+    expect(fetchMock).toHaveBeenCalledTimes(5);
+  });
+});
+
+describe('postEventStream', () => {
+  const fetchMock = vi.fn();
+  const STREAM_OPTIONS = { ...OPTIONS, timeoutMs: 1000 };
+
+  beforeEach(() => {
+    vi.useFakeTimers({ toFake: ['setTimeout', 'clearTimeout', 'Date'] });
+    vi.spyOn(Math, 'random').mockReturnValue(0);
+    vi.stubGlobal('fetch', fetchMock);
+  });
+
+  afterEach(() => {
+    fetchMock.mockReset();
+    vi.unstubAllGlobals();
+    vi.restoreAllMocks();
+    vi.useRealTimers();
+  });
+
+  it('requests an event stream and delivers events split across chunks', async () => {
+    const stream = eventStream();
+    fetchMock.mockImplementationOnce(stream.fetch);
+    stream.push('data: {"a"');
+    stream.push(':1}\n');
+    stream.push('\ndata: {"b":2}\n\n');
+    stream.close();
+
+    const events: string[] = [];
+    await postEventStream(API_URL, STREAM_OPTIONS, (data) => events.push(data));
+
+    expect(events).toEqual(['{"a":1}', '{"b":2}']);
+    expect(fetchMock.mock.calls[0][1].headers.Accept).toBe('text/event-stream');
+  });
+
+  it('handles CRLF line endings and ignores non-data lines', async () => {
+    const stream = eventStream();
+    fetchMock.mockImplementationOnce(stream.fetch);
+    stream.push(': keep-alive\r\n\r\nevent: message\r\ndata: one\r\n\r\ndata:two\r\n\r\n');
+    stream.close();
+
+    const events: string[] = [];
+    await postEventStream(API_URL, STREAM_OPTIONS, (data) => events.push(data));
+
+    expect(events).toEqual(['one', 'two']);
+  });
+
+  it('decodes multi-byte characters split across chunks', async () => {
+    const stream = eventStream();
+    fetchMock.mockImplementationOnce(stream.fetch);
+    const bytes = new TextEncoder().encode('data: héllo € 🙂\n\n');
+    for (let i = 0; i < bytes.length; i++) {
+      stream.push(bytes.slice(i, i + 1));
+    }
+    stream.close();
+
+    const events: string[] = [];
+    await postEventStream(API_URL, STREAM_OPTIONS, (data) => events.push(data));
+
+    expect(events).toEqual(['héllo € 🙂']);
+  });
+
+  it('stops at [DONE] and cancels the rest of the body', async () => {
+    const stream = eventStream();
+    fetchMock.mockImplementationOnce(stream.fetch);
+    stream.push('data: first\n\ndata: [DONE]\n\ndata: after\n\n');
+
+    const events: string[] = [];
+    await postEventStream(API_URL, STREAM_OPTIONS, (data) => events.push(data));
+
+    expect(events).toEqual(['first']);
+    expect(stream.cancel).toHaveBeenCalled();
+  });
+
+  it('cancels the body when onData throws', async () => {
+    const stream = eventStream();
+    fetchMock.mockImplementationOnce(stream.fetch);
+    stream.push('data: {bad json\n\n');
+
+    await expect(
+      postEventStream(API_URL, STREAM_OPTIONS, (data) => JSON.parse(data))
+    ).rejects.toThrow(SyntaxError);
+    expect(stream.cancel).toHaveBeenCalled();
+  });
+
+  it('resets the idle timeout whenever data arrives', async () => {
+    const stream = eventStream();
+    fetchMock.mockImplementationOnce(stream.fetch);
+
+    const events: string[] = [];
+    const promise = postEventStream(API_URL, STREAM_OPTIONS, (data) => events.push(data));
+
+    // 1.6s in total, but never more than 800ms without data
+    stream.push('data: 1\n\n');
+    await vi.advanceTimersByTimeAsync(800);
+    stream.push('data: 2\n\n');
+    await vi.advanceTimersByTimeAsync(800);
+    stream.push('data: 3\n\n');
+    stream.close();
+
+    await expect(promise).resolves.toBeUndefined();
+    expect(events).toEqual(['1', '2', '3']);
+  });
+
+  it('fails once the stream stalls for the idle timeout', async () => {
+    const stream = eventStream();
+    fetchMock.mockImplementationOnce(stream.fetch);
+
+    const events: string[] = [];
+    const assertion = expect(
+      postEventStream(API_URL, STREAM_OPTIONS, (data) => events.push(data))
+    ).rejects.toThrow('Stream stalled: no data for 1000ms');
+
+    stream.push('data: 1\n\n');
+    await vi.advanceTimersByTimeAsync(1000);
+
+    await assertion;
+    expect(events).toEqual(['1']);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+
+  it('retries a retryable status before the stream starts', async () => {
+    const stream = eventStream();
+    fetchMock
+      .mockResolvedValueOnce(jsonResponse(503, { error: 'busy' }))
+      .mockImplementationOnce(stream.fetch);
+    stream.push('data: ok\n\n');
+    stream.close();
+
+    const events: string[] = [];
+    const promise = postEventStream(API_URL, STREAM_OPTIONS, (data) => events.push(data));
+    await vi.advanceTimersByTimeAsync(1000);
+
+    await expect(promise).resolves.toBeUndefined();
+    expect(events).toEqual(['ok']);
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it('does not retry other 4xx responses', async () => {
+    fetchMock.mockResolvedValueOnce(jsonResponse(401, { error: 'bad key' }));
+
+    await expect(postEventStream(API_URL, STREAM_OPTIONS, () => {})).rejects.toThrow(
+      'HTTP 401: {"error":"bad key"}'
+    );
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+  });
+});
@@ -0,0 +1,207 @@
+/**
+ * Tests for the research response cache
+ */
+
+import { describe, expect, it, vi, beforeEach, afterEach } from 'vitest';
+import { existsSync, mkdtempSync, readFileSync, rmSync, utimesSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+
+type ResearchCacheModule = typeof import('../research-cache.js');
+
+/** Unit vectors: cos(fastapi, fastapi tips) = 0.95, cos(fastapi, django) = 0.8 */
+const VECTORS: Record<string, number[]> = {
+  'fastapi async performance': [1, 0, 0],
+  'fastapi async perf tips': [0.95, Math.sqrt(1 - 0.95 ** 2), 0],
+  'django async performance': [0.8, 0.6, 0],
+};
+
+const knowledge = vi.hoisted(() => ({
+  imported: false,
+  embed: vi.fn(),
+}));
+
+vi.mock('../knowledge.js', () => {
+  knowledge.imported = true;
+  return {
+    KnowledgeService: class {
+      embed(text: string): Promise<Float32Array> {
+        return knowledge.embed(text);
+      }
+    },
+  };
+});
+
+const TTL_MS = 60_000;
+const ANSWER = { content: 'Use async endpoints.', citations: ['https://example.test/a'] };
+
+describe('ResearchCache', () => {
+  let projectDir: string;
+  let cacheDir: string;
+  let mod: ResearchCacheModule;
+
+  beforeEach(async () => {
+    projectDir = mkdtempSync(join(tmpdir(), 'research-cache-'));
+    cacheDir = join(projectDir, '.allhands', 'harness', '.cache', 'perplexity');
+    vi.stubEnv('CLAUDE_PROJECT_DIR', projectDir);
+
+    // Fresh module graph per test so knowledge.js imports can be observed
+    vi.resetModules();
+    knowledge.imported = false;
+    knowledge.embed.mockReset();
+    knowledge.embed.mockImplementation(async (text: string) => {
+      const vector = VECTORS[text];
+      if (!vector) throw new Error(`no embedding for "${text}"`);
+      return new Float32Array(vector);
+    });
+    mod = await import('../research-cache.js');
+  });
+
+  afterEach(() => {
+    vi.unstubAllEnvs();
+    vi.restoreAllMocks();
+    rmSync(projectDir, { recursive: true, force: true });
+  });
+
+  function readIndex(): { entries: Array<Record<string, unknown>> } {
+    return JSON.parse(readFileSync(join(cacheDir, 'index.json'), 'utf-8'));
+  }
+
+  it('returns an exact hit regardless of case and whitespace', async () => {
+    const cache = new mod.ResearchCache('perplexity', TTL_MS);
+    await cache.store('What is  FastAPI?', ANSWER);
+
+    const hit = await cache.lookup('  what is\tfastapi? ');
+
+    expect(hit).toMatchObject({
+      type: 'exact_hit',
+      similarity: 1,
+      cachedQuery: 'What is  FastAPI?',
+      ...ANSWER,
+    });
+  });
+
+  it('misses an unrelated query', async () => {
+    const cache = new mod.ResearchCache('perplexity', TTL_MS);
+    await cache.store('What is FastAPI?', ANSWER);
+
+    await expect(cache.lookup('What is Django?')).resolves.toBeNull();
+  });
+
+  it('ignores entries older than the TTL', async () => {
+    const now = vi.spyOn(Date, 'now').mockReturnValue(1_000_000);
+    const cache = new mod.ResearchCache('perplexity', TTL_MS);
+    await cache.store('What is FastAPI?', ANSWER);
+
+    now.mockReturnValue(1_000_000 + TTL_MS);
+    await expect(cache.lookup('What is FastAPI?')).resolves.not.toBeNull();
+
+    now.mockReturnValue(1_000_000 + TTL_MS + 1);
+    await expect(cache.lookup('What is FastAPI?')).resolves.toBeNull();
+  });
+
+  it('replaces the entry when the same query is stored again', async () => {
+    const cache = new mod.ResearchCache('perplexity', TTL_MS);
+    await cache.store('What is FastAPI?', ANSWER);
+    await cache.store('WHAT IS FASTAPI?', { content: 'Updated.', citations: [] });
+
+    const hit = await cache.lookup('what is fastapi?');
+
+    expect(hit?.content).toBe('Updated.');
+    expect(readIndex().entries).toHaveLength(1);
+  });
+
+  it('evicts the oldest entries beyond 200', async () => {
+    const cache = new mod.ResearchCache('perplexity', TTL_MS);
+    for (let i = 0; i <= 200; i++) {
+      await cache.store(`query ${i}`, ANSWER);
+    }
+
+    expect(readIndex().entries).toHaveLength(200);
+    await expect(cache.lookup('query 0')).resolves.toBeNull();
+    await expect(cache.lookup('query 1')).resolves.not.toBeNull();
+    await expect(cache.lookup('query 200')).resolves.not.toBeNull();
+  });
+
+  it('never loads the embedding model when semantic matching is off', async () => {
+    const cache = new mod.ResearchCache('perplexity', TTL_MS, { semantic: false });
+    await cache.store('FastAPI async performance', ANSWER);
+
+    await expect(cache.lookup('FastAPI async perf tips')).resolves.toBeNull();
+    expect(knowledge.imported).toBe(false);
+    expect(knowledge.embed).not.toHaveBeenCalled();
+    expect(existsSync(join(cacheDir, 'embeddings.json'))).toBe(false);
+  });
+
+  it('returns a semantic hit at or above the threshold and misses below it', async () => {
+    await new mod.ResearchCache('perplexity', TTL_MS, { semantic: true }).store(
+      'FastAPI async performance',
+      ANSWER
+    );
+    const cache = new mod.ResearchCache('perplexity', TTL_MS, { semantic: true });
+
+    const hit = await cache.lookup('FastAPI async perf tips');
+    expect(hit).toMatchObject({ type: 'semantic_hit', cachedQuery: 'FastAPI async performance' });
+    expect(hit?.similarity).toBeCloseTo(0.95, 3);
+
+    await expect(cache.lookup('Django async performance')).resolves.toBeNull();
+  });
+
+  it('keeps rounded embeddings out of the index file', async () => {
+    const cache = new mod.ResearchCache('perplexity', TTL_MS, { semantic: true });
+    await cache.store('FastAPI async perf tips', ANSWER);
+
+    expect(readIndex().entries[0]).not.toHaveProperty('embedding');
+    const embeddings = JSON.parse(readFileSync(join(cacheDir, 'embeddings.json'), 'utf-8'));
+    expect(Object.values(embeddings)).toEqual([[0.95, 0.3122, 0]]);
+  });
+
+  it('falls back to exact matching when embedding fails', async () => {
+    knowledge.embed.mockRejectedValue(new Error('model unavailable'));
+    const cache = new mod.ResearchCache('perplexity', TTL_MS, { semantic: true });
+    await cache.store('FastAPI async performance', ANSWER);
+
+    await expect(cache.lookup('FastAPI async perf tips')).resolves.toBeNull();
+    await expect(cache.lookup('fastapi async performance')).resolves.toMatchObject({
+      type: 'exact_hit',
+    });
+  });
+});
+
+describe('readCachedResponse', () => {
+  let projectDir: string;
+  let mod: ResearchCacheModule;
+
+  beforeEach(async () => {
+    projectDir = mkdtempSync(join(tmpdir(), 'research-cache-'));
+    vi.stubEnv('CLAUDE_PROJECT_DIR', projectDir);
+    mod = await import('../research-cache.js');
+  });
+
+  afterEach(() => {
+    vi.unstubAllEnvs();
+    rmSync(projectDir, { recursive: true, force: true });
+  });
+
+  it('returns a stored response younger than the TTL', () => {
+    const key = mod.hashKey('request body');
+    mod.writeCachedResponse('xai', key, { ok: true });
+
+    expect(mod.readCachedResponse('xai', key, TTL_MS)).toEqual({ ok: true });
+  });
+
+  it('expires responses by file mtime', () => {
+    const key = mod.hashKey('request body');
+    mod.writeCachedResponse('xai', key, { ok: true });
+
+    const path = join(projectDir, '.allhands', 'harness', '.cache', 'xai', key.slice(0, 2), `${key}.json`);
+    const stale = (Date.now() - TTL_MS - 1000) / 1000;
+    utimesSync(path, stale, stale);
+
+    expect(mod.readCachedResponse('xai', key, TTL_MS)).toBeNull();
+  });
+
+  it('returns null for a missing key', () => {
+    expect(mod.readCachedResponse('xai', mod.hashKey('never stored'), TTL_MS)).toBeNull();
+  });
+});
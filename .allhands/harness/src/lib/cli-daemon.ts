@@ -176,14 +176,26 @@ async function processCommand(command: DaemonCommand): Promise<unknown> {
  */
 function createConnectionHandler() {
   return function handleConnection(socket: Socket): void {
-    let buffer = '';
-
-    socket.on('data', async (data) => {
-      buffer += data.toString();
+    // Bytes of the current (incomplete) message. Kept as raw chunks so only
+    // each new chunk is scanned for the delimiter, and multi-byte UTF-8
+    // characters split across chunks decode correctly.
+    let pending: Buffer[] = [];
 
+    socket.on('data', async (data: Buffer) => {
       // Process complete JSON messages (newline-delimited)
-      const lines = buffer.split('\n');
-      buffer = lines.pop() ?? '';
+      const lines: string[] = [];
+      let start = 0;
+      let newline = data.indexOf(0x0a);
+      while (newline !== -1) {
+        pending.push(data.subarray(start, newline));
+        lines.push(Buffer.concat(pending).toString('utf8'));
+        pending = [];
+        start = newline + 1;
+        newline = data.indexOf(0x0a, start);
+      }
+      if (start < data.length) {
+        pending.push(data.subarray(start));
+      }
 
       for (const line of lines) {
         if (!line.trim()) continue;
@@ -21,7 +21,7 @@ import {
   parsePromptFile,
 } from './prompts.js';
 import { readAlignment, getCurrentBranch } from './planning.js';
-import { gitExec } from './git.js';
+import { gitExec, truncateLines } from './git.js';
 
 export interface CompactionInput {
   conversationLogs: string; // File path
@@ -82,15 +82,8 @@ export function getGitDiffFull(cwd?: string, maxLines: number = 500): string {
 
   try {
     const diffResult = gitExec(['diff', 'HEAD'], workingDir);
-    const diff = diffResult.stdout;
-
     // Truncate if too long
-    const lines = diff.split('\n');
-    if (lines.length > maxLines) {
-      return lines.slice(0, maxLines).join('\n') + '\n... (truncated)';
-    }
-
-    return diff;
+    return truncateLines(diffResult.stdout, maxLines);
   } catch {
     return '';
   }
@@ -135,6 +135,20 @@ export function getDiff(ref: string): string {
   }
 }
 
+/**
+ * Truncate text (typically a diff) to its first maxLines lines.
+ * Scans for newlines and slices once instead of splitting the whole text,
+ * so cost is proportional to the kept prefix rather than the full diff.
+ */
+export function truncateLines(text: string, maxLines: number): string {
+  let end = -1;
+  for (let i = 0; i < maxLines; i++) {
+    end = text.indexOf("\n", end + 1);
+    if (end === -1) return text;
+  }
+  return text.slice(0, Math.max(end, 0)) + "\n... (truncated)";
+}
+
 /**
  * Get the project root directory (where .git is located).
  * Uses CLAUDE_PROJECT_DIR if available (for hooks), else current directory.
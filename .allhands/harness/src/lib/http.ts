@@ -0,0 +1,255 @@
+/**
+ * HTTP - Shared JSON client for external research APIs
+ *
+ * Perplexity and Grok calls go through a single client so they share
+ * default headers, bearer auth, and timeout handling instead of each
+ * command building its own fetch call.
+ *
+ * Transient failures (rate limits, 5xx, dropped connections) are retried
+ * with exponential backoff plus jitter, honoring Retry-After when present.
+ *
+ * postEventStream consumes server-sent event responses incrementally, for
+ * APIs that stream completions token by token.
+ */
+
+/** Headers sent with every request */
+const DEFAULT_HEADERS: Readonly<Record<string, string>> = {
+  'Content-Type': 'application/json',
+  Accept: 'application/json',
+};
+
+/** Status codes worth retrying: rate limiting and transient upstream failures */
+const RETRYABLE_STATUS = new Set([429, 500, 502, 503, 504]);
+
+/** Retries after the initial attempt */
+const MAX_RETRIES = 4;
+
+/** Base delay for exponential backoff (1s, 2s, 4s, 8s) */
+const BACKOFF_BASE_MS = 1000;
+
+/** Max random jitter added on top of each backoff, as a fraction of it */
+const BACKOFF_JITTER = 0.25;
+
+/** Upper bound on a server-requested Retry-After wait */
+const MAX_RETRY_AFTER_MS = 60000;
+
+export interface PostJsonOptions {
+  /** Bearer token for the Authorization header */
+  apiKey: string;
+  /** Request payload: an object to serialize, or an already-serialized JSON string */
+  body: object | string;
+  /** Abort each attempt after this many milliseconds */
+  timeoutMs: number;
+}
+
+interface RawResponse {
+  status: number;
+  headers: Headers;
+  text: string;
+}
+
+/**
+ * POST a JSON payload and parse the JSON response.
+ *
+ * Retries 429/5xx responses and connection-level errors up to MAX_RETRIES
+ * times. Timeouts are not retried: a request that ran out its full budget
+ * would most likely do so again. Throws on non-2xx responses with the
+ * status and response body.
+ */
+export async function postJson<T>(url: string, options: PostJsonOptions): Promise<T> {
+  const init: RequestInit = {
+    method: 'POST',
+    headers: {
+      ...DEFAULT_HEADERS,
+      Authorization: `Bearer ${options.apiKey}`,
+    },
+    body: typeof options.body === 'string' ? options.body : JSON.stringify(options.body),
+  };
+
+  for (let attempt = 0; ; attempt++) {
+    let response: RawResponse;
+    try {
+      response = await sendOnce(url, init, options.timeoutMs);
+    } catch (e) {
+      if (isAbortError(e)) {
+        throw new Error(`Request timed out after ${options.timeoutMs}ms`);
+      }
+      if (attempt >= MAX_RETRIES) throw e;
+      await sleep(backoffDelay(attempt));
+      continue;
+    }
+
+    if (response.status >= 200 && response.status < 300) {
+      return JSON.parse(response.text) as T;
+    }
+
+    if (!RETRYABLE_STATUS.has(response.status) || attempt >= MAX_RETRIES) {
+      throw new Error(`HTTP ${response.status}: ${response.text}`);
+    }
+
+    const retryAfter = parseRetryAfter(response.headers.get('retry-after'));
+    await sleep(retryAfter ?? backoffDelay(attempt));
+  }
+}
+
+/**
+ * POST a JSON payload and consume a server-sent event stream.
+ *
+ * Calls onData with each event's `data:` payload as it arrives and resolves
+ * at `[DONE]` or end of stream. Non-2xx responses are retried like postJson
+ * until the stream starts; an interrupted stream is not retried since
+ * events were already delivered. timeoutMs is an idle timeout: it restarts
+ * whenever bytes arrive, so long answers can finish while a stalled stream
+ * fails fast.
+ */
+export async function postEventStream(
+  url: string,
+  options: PostJsonOptions,
+  onData: (data: string) => void
+): Promise<void> {
+  const init: RequestInit = {
+    method: 'POST',
+    headers: {
+      ...DEFAULT_HEADERS,
+      Accept: 'text/event-stream',
+      Authorization: `Bearer ${options.apiKey}`,
+    },
+    body: typeof options.body === 'string' ? options.body : JSON.stringify(options.body),
+  };
+
+  for (let attempt = 0; ; attempt++) {
+    const controller = new AbortController();
+    let timeout = setTimeout(() => controller.abort(), options.timeoutMs);
+    const resetTimeout = (): void => {
+      clearTimeout(timeout);
+      timeout = setTimeout(() => controller.abort(), options.timeoutMs);
+    };
+
+    let response: Response;
+    try {
+      response = await fetch(url, { ...init, signal: controller.signal });
+    } catch (e) {
+      clearTimeout(timeout);
+      if (isAbortError(e)) {
+        throw new Error(`Request timed out after ${options.timeoutMs}ms`);
+      }
+      if (attempt >= MAX_RETRIES) throw e;
+      await sleep(backoffDelay(attempt));
+      continue;
+    }
+
+    if (!response.ok || !response.body) {
+      const text = await response.text().finally(() => clearTimeout(timeout));
+      if (!RETRYABLE_STATUS.has(response.status) || attempt >= MAX_RETRIES) {
+        throw new Error(`HTTP ${response.status}: ${text}`);
+      }
+      const retryAfter = parseRetryAfter(response.headers.get('retry-after'));
+      await sleep(retryAfter ?? backoffDelay(attempt));
+      continue;
+    }
+
+    try {
+      await readEventStream(response.body, onData, resetTimeout);
+      return;
+    } catch (e) {
+      if (isAbortError(e)) {
+        throw new Error(`Stream stalled: no data for ${options.timeoutMs}ms`);
+      }
+      throw e;
+    } finally {
+      clearTimeout(timeout);
+    }
+  }
+}
+
+/**
+ * Split an SSE byte stream into lines and deliver each `data:` payload.
+ */
+async function readEventStream(
+  body: ReadableStream<Uint8Array>,
+  onData: (data: string) => void,
+  onBytes: () => void
+): Promise<void> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  try {
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) return;
+      onBytes();
+      buffer += decoder.decode(value, { stream: true });
+
+      let start = 0;
+      let newline = buffer.indexOf('\n');
+      while (newline !== -1) {
+        const line = buffer.slice(start, newline).replace(/\r$/, '');
+        start = newline + 1;
+        newline = buffer.indexOf('\n', start);
+
+        if (!line.startsWith('data:')) continue;
+        const data = line.slice(5).trimStart();
+        if (data === '[DONE]') return;
+        onData(data);
+      }
+      buffer = buffer.slice(start);
+    }
+  } finally {
+    // Release the connection when stopping early ([DONE] or a throwing
+    // onData); a no-op once the stream has ended
+    reader.cancel().catch(() => {});
+  }
+}
+
+/**
+ * Perform a single request, reading the full body within the timeout.
+ */
+async function sendOnce(url: string, init: RequestInit, timeoutMs: number): Promise<RawResponse> {
+  const controller = new AbortController();
+  const timeout = setTimeout(() => controller.abort(), timeoutMs);
+
+  try {
+    const response = await fetch(url, { ...init, signal: controller.signal });
+    return {
+      status: response.status,
+      headers: response.headers,
+      text: await response.text(),
+    };
+  } finally {
+    clearTimeout(timeout);
+  }
+}
+
+/**
+ * Exponential backoff with uniform jitter for the given (0-based) retry.
+ */
+function backoffDelay(attempt: number): number {
+  const backoff = BACKOFF_BASE_MS * 2 ** attempt;
+  return backoff + Math.random() * BACKOFF_JITTER * backoff;
+}
+
+/**
+ * Parse a Retry-After header (delta-seconds or HTTP-date) into milliseconds.
+ * Returns null when the header is absent or unparseable.
+ */
+function parseRetryAfter(header: string | null): number | null {
+  if (!header) return null;
+
+  const seconds = Number(header);
+  if (Number.isFinite(seconds)) {
+    return Math.min(Math.max(0, seconds * 1000), MAX_RETRY_AFTER_MS);
+  }
+
+  const date = Date.parse(header);
+  if (Number.isNaN(date)) return null;
+  return Math.min(Math.max(0, date - Date.now()), MAX_RETRY_AFTER_MS);
+}
+
+function isAbortError(e: unknown): boolean {
+  return e instanceof Error && e.name === 'AbortError';
+}
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
@@ -7,7 +7,7 @@ import { spawn } from "child_process";
 import { existsSync, mkdirSync, readdirSync, readFileSync, statSync, writeFileSync } from "fs";
 import matter from "gray-matter";
 import { basename, extname, join, relative } from "path";
-import { Index, MetricKind, ScalarKind } from "usearch";
+import type { Index } from "usearch";
 import { loadProjectSettings } from "../hooks/shared.js";
 
 // Types
@@ -186,9 +186,12 @@ export class KnowledgeService {
   }
 
   /**
-   * Create a new USearch index
+   * Create a new USearch index.
+   * usearch (a native addon) is imported here rather than at module top so
+   * commands that merely import this module don't load it at CLI startup.
    */
-  private createIndex(): Index {
+  private async createIndex(): Promise<Index> {
+    const { Index, MetricKind, ScalarKind } = await import("usearch");
     return new Index(
       768,                // dimensions
       MetricKind.Cos,     // metric
@@ -205,12 +208,12 @@ export class KnowledgeService {
 
     if (!existsSync(paths.index) || !existsSync(paths.meta)) {
       return {
-        index: this.createIndex(),
+        index: await this.createIndex(),
         meta: this.createEmptyMetadata(),
       };
     }
 
-    const index = this.createIndex();
+    const index = await this.createIndex();
     index.load(paths.index);
 
     const meta: IndexMetadata = JSON.parse(readFileSync(paths.meta, "utf-8"));
@@ -409,7 +412,7 @@ export class KnowledgeService {
     this.log(`[knowledge] Reindexing ${indexName}...`);
 
     // Create fresh index
-    const index = this.createIndex();
+    const index = await this.createIndex();
     const meta = this.createEmptyMetadata();
 
     // Discover and index files
@@ -10,7 +10,6 @@
  */
 
 import { existsSync, readFileSync } from 'fs';
-import { GoogleGenAI } from '@google/genai';
 import { loadProjectSettings } from '../hooks/shared.js';
 
 // ============================================================================
@@ -178,6 +177,10 @@ async function callGemini(
   timeout: number
 ): Promise<ProviderResult> {
   // Initialize with API key only - this uses Gemini Developer API, not Vertex AI
+  // The SDK is imported on first use: commands/oracle.ts imports this module
+  // and every command module is loaded at CLI startup, so a top-level import
+  // would cost every `ah` invocation, including hooks that never call an LLM.
+  const { GoogleGenAI } = await import('@google/genai');
   const ai = new GoogleGenAI({ apiKey });
 
   // Create abort controller for timeout
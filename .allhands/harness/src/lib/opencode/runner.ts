@@ -3,7 +3,6 @@
  * Each run spawns a fresh server instance, executes the agent, and cleans up.
  */
 
-import { createOpencode } from "@opencode-ai/sdk";
 import { existsSync, readFileSync, statSync } from "fs";
 import { join } from "path";
 import { logCommandStart, logCommandSuccess, logCommandError } from "../trace-store.js";
@@ -144,6 +143,9 @@ export class AgentRunner {
         opencodeConfig.mcp = config.mcp;
       }
 
+      // Loaded lazily: command modules import this at CLI startup, but only
+      // agent runs need the SDK
+      const { createOpencode } = await import("@opencode-ai/sdk");
       const { client, server: srv } = await createOpencode({
         port: 0, // Let OS pick available port to avoid conflicts in parallel runs
         timeout: config.timeoutMs ?? DEFAULT_TIMEOUT_MS,
@@ -28,7 +28,7 @@ import {
   sanitizeBranchForDir,
   getCurrentBranch,
 } from './planning.js';
-import { getBaseBranch, gitExec, validateGitRef, syncWithOriginMain } from './git.js';
+import { getBaseBranch, gitExec, validateGitRef, syncWithOriginMain, truncateLines } from './git.js';
 import { logEvent } from './trace-store.js';
 
 // ============================================================================
@@ -166,12 +166,7 @@ function getGitDiffFromBase(cwd?: string, maxLines: number = 300): string {
 
     // Get actual diff (truncated)
     const diffResult = gitExec(['diff', `${baseBranch}...HEAD`], workingDir);
-    const diff = diffResult.stdout;
-
-    const lines = diff.split('\n');
-    const truncatedDiff = lines.length > maxLines
-      ? lines.slice(0, maxLines).join('\n') + '\n... (truncated)'
-      : diff;
+    const truncatedDiff = truncateLines(diffResult.stdout, maxLines);
 
     return `### Summary\n${diffStat}\n\n### Changes\n${truncatedDiff}`;
   } catch {
@@ -254,6 +249,9 @@ Group the changed files into logical review buckets based on the alignment docum
   }
 }
 
+/** Matches "diff --git a/path b/path" headers, capturing the path */
+const DIFF_FILE_HEADER_PATTERN = /^diff --git a\/(.+) b\//;
+
 /**
  * Parse changed file paths from git diff output
  */
@@ -262,7 +260,7 @@ function parseChangedFilesFromDiff(gitDiff: string): string[] {
   const lines = gitDiff.split('\n');
   for (const line of lines) {
     // Match "diff --git a/path b/path" format
-    const match = line.match(/^diff --git a\/(.+) b\//);
+    const match = line.match(DIFF_FILE_HEADER_PATTERN);
     if (match) {
       files.push(match[1]);
     }
@@ -0,0 +1,266 @@
+/**
+ * Research Cache - On-disk response cache for web research commands.
+ *
+ * Perplexity research calls are slow and billed per query, and agents often
+ * re-ask the same question in slightly different words. Lookups go through
+ * two tiers:
+ *   1. Exact match: sha256 of the normalized query (no model load)
+ *   2. Semantic match (opt-in): cosine similarity of query embeddings, using
+ *      the same local embedding model as the knowledge index
+ *
+ * Entries live in .allhands/harness/.cache/<namespace>/index.json and expire
+ * after a TTL. Query embeddings are kept apart in embeddings.json, so exact
+ * lookups never parse them. Embedding failures degrade to exact-match only.
+ *
+ * For deterministic request/response pairs (e.g. a fixed prompt sent to
+ * Grok), readCachedResponse/writeCachedResponse provide a plain keyed cache
+ * sharded as <namespace>/<key[:2]>/<key>.json.
+ */
+
+import { createHash } from 'crypto';
+import { existsSync, mkdirSync, readFileSync, renameSync, statSync, writeFileSync } from 'fs';
+import { join } from 'path';
+import { getCacheSubdir, getProjectDir } from '../hooks/shared.js';
+
+/**
+ * Minimum cosine similarity for a semantic hit. Not calibrated against the
+ * knowledge index's embedding model, so the semantic tier is opt-in: nearby
+ * but distinct questions may clear it and receive each other's answers.
+ */
+const SEMANTIC_SIMILARITY_THRESHOLD = 0.92;
+
+/** Oldest entries are evicted beyond this many */
+const MAX_ENTRIES = 200;
+
+/** Stored embedding precision; far below what the similarity cutoff can resolve */
+const EMBEDDING_SCALE = 1e4;
+
+export interface CachedResearch {
+  content: string;
+  citations: string[];
+}
+
+export interface CacheHit extends CachedResearch {
+  type: 'exact_hit' | 'semantic_hit';
+  /** Query the cached answer was originally produced for */
+  cachedQuery: string;
+  similarity: number;
+  cachedAt: string;
+}
+
+interface CacheEntry extends CachedResearch {
+  key: string;
+  query: string;
+  ts: number;
+}
+
+export interface ResearchCacheOptions {
+  /** Also match near-identical queries by embedding similarity (loads the embedding model) */
+  semantic?: boolean;
+}
+
+interface CacheIndex {
+  entries: CacheEntry[];
+}
+
+/** Query embeddings by entry key */
+type EmbeddingIndex = Record<string, number[]>;
+
+/**
+ * Normalize a query for exact matching (case and whitespace insensitive).
+ */
+export function normalizeQuery(query: string): string {
+  return query.toLowerCase().replace(/\s+/g, ' ').trim();
+}
+
+/**
+ * sha256 hex digest of a string.
+ */
+export function hashKey(value: string): string {
+  return createHash('sha256').update(value).digest('hex');
+}
+
+/**
+ * Read a JSON file, returning null if missing or unparseable.
+ */
+export function readJsonFile<T>(path: string): T | null {
+  if (!existsSync(path)) return null;
+  try {
+    return JSON.parse(readFileSync(path, 'utf-8')) as T;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Write a JSON file atomically (temp file + rename) so concurrent readers
+ * never observe a partially written file.
+ */
+export function writeJsonAtomic(path: string, data: unknown): void {
+  const tmpPath = `${path}.${process.pid}.tmp`;
+  writeFileSync(tmpPath, JSON.stringify(data));
+  renameSync(tmpPath, path);
+}
+
+/**
+ * Read a keyed response if it exists and is younger than ttlMs.
+ */
+export function readCachedResponse<T>(namespace: string, key: string, ttlMs: number): T | null {
+  const path = join(getCacheSubdir(namespace), key.slice(0, 2), `${key}.json`);
+  if (!existsSync(path)) return null;
+  if (Date.now() - statSync(path).mtimeMs > ttlMs) return null;
+  return readJsonFile<T>(path);
+}
+
+/**
+ * Store a keyed response (atomically).
+ */
+export function writeCachedResponse(namespace: string, key: string, data: unknown): void {
+  const dir = join(getCacheSubdir(namespace), key.slice(0, 2));
+  mkdirSync(dir, { recursive: true });
+  writeJsonAtomic(join(dir, `${key}.json`), data);
+}
+
+function cosineSimilarity(a: ArrayLike<number>, b: ArrayLike<number>): number {
+  if (a.length !== b.length) return 0;
+  let dot = 0;
+  let normA = 0;
+  let normB = 0;
+  for (let i = 0; i < a.length; i++) {
+    dot += a[i] * b[i];
+    normA += a[i] * a[i];
+    normB += b[i] * b[i];
+  }
+  const denom = Math.sqrt(normA) * Math.sqrt(normB);
+  return denom === 0 ? 0 : dot / denom;
+}
+
+export class ResearchCache {
+  private readonly indexPath: string;
+  private readonly embeddingsPath: string;
+  private readonly ttlMs: number;
+  private readonly semantic: boolean;
+  private queryEmbedding: { query: string; embedding: Float32Array | null } | null = null;
+
+  constructor(namespace: string, ttlMs: number, options: ResearchCacheOptions = {}) {
+    const dir = getCacheSubdir(namespace);
+    this.indexPath = join(dir, 'index.json');
+    this.embeddingsPath = join(dir, 'embeddings.json');
+    this.ttlMs = ttlMs;
+    this.semantic = options.semantic ?? false;
+  }
+
+  /**
+   * Find a fresh cached answer for the query (exact first, then semantic
+   * when enabled).
+   */
+  async lookup(query: string): Promise<CacheHit | null> {
+    const entries = this.loadFreshEntries();
+    if (entries.length === 0) return null;
+
+    const key = hashKey(normalizeQuery(query));
+    const exact = entries.find((e) => e.key === key);
+    if (exact) {
+      return this.toHit(exact, 'exact_hit', 1);
+    }
+    if (!this.semantic) return null;
+
+    const embeddings = this.loadEmbeddings();
+    const candidates = entries.filter((e) => embeddings[e.key]);
+    if (candidates.length === 0) return null;
+
+    const embedding = await this.embedQuery(query);
+    if (!embedding) return null;
+
+    let best: CacheEntry | null = null;
+    let bestSimilarity = 0;
+    for (const entry of candidates) {
+      const similarity = cosineSimilarity(embedding, embeddings[entry.key]);
+      if (similarity > bestSimilarity) {
+        best = entry;
+        bestSimilarity = similarity;
+      }
+    }
+
+    if (best && bestSimilarity >= SEMANTIC_SIMILARITY_THRESHOLD) {
+      return this.toHit(best, 'semantic_hit', bestSimilarity);
+    }
+    return null;
+  }
+
+  /**
+   * Store an answer, replacing any entry for the same normalized query.
+   * The query is embedded only when the semantic tier is enabled.
+   */
+  async store(query: string, research: CachedResearch): Promise<void> {
+    const key = hashKey(normalizeQuery(query));
+    const embedding = this.semantic ? await this.embedQuery(query) : null;
+
+    const entries = this.loadFreshEntries().filter((e) => e.key !== key);
+    entries.push({
+      key,
+      query,
+      content: research.content,
+      citations: research.citations,
+      ts: Date.now(),
+    });
+
+    const index: CacheIndex = { entries: entries.slice(-MAX_ENTRIES) };
+    writeJsonAtomic(this.indexPath, index);
+
+    if (embedding) {
+      // Keep only vectors for entries still in the index
+      const stored = this.loadEmbeddings();
+      const embeddings: EmbeddingIndex = {};
+      for (const entry of index.entries) {
+        if (stored[entry.key]) embeddings[entry.key] = stored[entry.key];
+      }
+      embeddings[key] = Array.from(embedding, (v) => Math.round(v * EMBEDDING_SCALE) / EMBEDDING_SCALE);
+      writeJsonAtomic(this.embeddingsPath, embeddings);
+    }
+  }
+
+  private loadFreshEntries(): CacheEntry[] {
+    const index = readJsonFile<CacheIndex>(this.indexPath);
+    if (!index || !Array.isArray(index.entries)) return [];
+    const cutoff = Date.now() - this.ttlMs;
+    return index.entries.filter((e) => e.ts >= cutoff);
+  }
+
+  private loadEmbeddings(): EmbeddingIndex {
+    return readJsonFile<EmbeddingIndex>(this.embeddingsPath) ?? {};
+  }
+
+  /**
+   * Embed the query once per instance (shared by lookup and store).
+   * Returns null if the embedding model cannot be loaded.
+   */
+  private async embedQuery(query: string): Promise<Float32Array | null> {
+    if (this.queryEmbedding?.query === query) {
+      return this.queryEmbedding.embedding;
+    }
+
+    let embedding: Float32Array | null = null;
+    try {
+      const { KnowledgeService } = await import('./knowledge.js');
+      const service = new KnowledgeService(getProjectDir(), { quiet: true });
+      embedding = await service.embed(normalizeQuery(query));
+    } catch {
+      embedding = null;
+    }
+
+    this.queryEmbedding = { query, embedding };
+    return embedding;
+  }
+
+  private toHit(entry: CacheEntry, type: CacheHit['type'], similarity: number): CacheHit {
+    return {
+      type,
+      content: entry.content,
+      citations: entry.citations,
+      cachedQuery: entry.query,
+      similarity,
+      cachedAt: new Date(entry.ts).toISOString(),
+    };
+  }
+}
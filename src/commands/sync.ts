@@ -1,4 +1,4 @@
-import { copyFileSync, existsSync, mkdirSync, readFileSync, unlinkSync, writeFileSync } from 'fs';
+import { copyFileSync, existsSync, mkdirSync, readFileSync, statSync, unlinkSync, writeFileSync, type BigIntStats } from 'fs';
 import { homedir } from 'os';
 import { basename, dirname, join, resolve } from 'path';
 import { isGitRepo, getStagedFiles } from '../lib/git.js';
@@ -8,6 +8,7 @@ import { ConflictResolution, askConflictResolution, confirm, getNextBackupPath }
 import { SYNC_CONFIG_FILENAME, SYNC_CONFIG_TEMPLATE } from '../lib/constants.js';
 import { restoreDotfiles } from '../lib/dotfiles.js';
 import { ensureTargetLines } from '../lib/target-lines.js';
+import { copyFileWithMtime } from '../lib/fs-utils.js';
 import { writeSyncState } from '../lib/sync-state.js';
 
 const AH_SHIM_SCRIPT = `#!/bin/bash
@@ -122,21 +123,34 @@ export async function cmdSync(target: string = '.', autoYes: boolean = false, in
   const conflicts: string[] = [];
   const deletedInSource: string[] = [];
 
-  // Detect conflicts and deleted files
+  // Stat every manifest path once on each side. Existence checks, the
+  // size+mtime comparison, and mtime preservation on copy all reuse these.
+  const sourceStats = new Map<string, BigIntStats | undefined>();
+  const targetStats = new Map<string, BigIntStats | undefined>();
+  const statOptions = { bigint: true, throwIfNoEntry: false } as const;
   for (const relPath of distributable) {
-    const sourceFile = join(allhandsRoot, relPath);
-    const targetFile = join(resolvedTarget, relPath);
+    sourceStats.set(relPath, statSync(join(allhandsRoot, relPath), statOptions));
+    targetStats.set(relPath, statSync(join(resolvedTarget, relPath), statOptions));
+  }
 
-    if (!existsSync(sourceFile)) {
+  // Detect conflicts and deleted files. Each existing target is compared
+  // once here; the copy pass below reuses the result via conflictSet.
+  for (const relPath of distributable) {
+    const sourceStat = sourceStats.get(relPath);
+    const targetStat = targetStats.get(relPath);
+
+    if (!sourceStat) {
       // Update-only: track deleted files
-      if (!isFirstTime && existsSync(targetFile)) {
+      if (!isFirstTime && targetStat) {
         deletedInSource.push(relPath);
       }
       continue;
     }
 
-    if (existsSync(targetFile)) {
-      if (filesAreDifferent(sourceFile, targetFile)) {
+    if (targetStat) {
+      const sourceFile = join(allhandsRoot, relPath);
+      const targetFile = join(resolvedTarget, relPath);
+      if (filesAreDifferent(sourceFile, targetFile, sourceStat, targetStat)) {
         conflicts.push(relPath);
       }
     }
@@ -166,6 +180,8 @@ export async function cmdSync(target: string = '.', autoYes: boolean = false, in
     }
   }
 
+  const conflictSet = new Set(conflicts);
+
   // Copy files
   console.log('\nCopying allhands files...');
   console.log(`Found ${distributable.size} files to distribute`);
@@ -175,22 +191,22 @@ export async function cmdSync(target: string = '.', autoYes: boolean = false, in
   for (const relPath of [...distributable].sort()) {
     const sourceFile = join(allhandsRoot, relPath);
     const targetFile = join(resolvedTarget, relPath);
+    const sourceStat = sourceStats.get(relPath);
 
-    if (!existsSync(sourceFile)) continue;
+    if (!sourceStat) continue;
 
     syncedFiles.add(relPath);
 
-    mkdirSync(dirname(targetFile), { recursive: true });
-
-    if (existsSync(targetFile)) {
-      if (!filesAreDifferent(sourceFile, targetFile)) {
+    if (targetStats.get(relPath)) {
+      if (!conflictSet.has(relPath)) {
         skipped++;
         continue;
       }
-      copyFileSync(sourceFile, targetFile);
+      copyFileWithMtime(sourceFile, targetFile, sourceStat);
       copied++;
     } else {
-      copyFileSync(sourceFile, targetFile);
+      mkdirSync(dirname(targetFile), { recursive: true });
+      copyFileWithMtime(sourceFile, targetFile, sourceStat);
       created++;
     }
   }
@@ -1,4 +1,4 @@
-import { existsSync, readdirSync } from 'fs';
+import { constants, copyFileSync, existsSync, readdirSync, statSync, utimesSync, type BigIntStats } from 'fs';
 import { join } from 'path';
 
 export function walkDir(dir: string, callback: (filePath: string) => void): void {
@@ -16,3 +16,26 @@ export function walkDir(dir: string, callback: (filePath: string) => void): void
     }
   }
 }
+
+/**
+ * Copy file contents (reflinked where the filesystem supports it, otherwise
+ * a kernel-side copy) and carry over the source timestamps, so the next
+ * sync's size+mtime check in filesAreDifferent can skip reading the file.
+ *
+ * Setting explicit times requires owning dest, which write permission alone
+ * does not give (e.g. a group-writable file owned by someone else). The
+ * contents are already copied by then and the mtime is only an optimization,
+ * so a failure there is ignored; the next comparison just reads the file.
+ */
+export function copyFileWithMtime(
+  src: string,
+  dest: string,
+  srcStat: BigIntStats = statSync(src, { bigint: true })
+): void {
+  copyFileSync(src, dest, constants.COPYFILE_FICLONE);
+  try {
+    utimesSync(dest, Number(srcStat.atimeNs) / 1e9, Number(srcStat.mtimeNs) / 1e9);
+  } catch {
+    // Keep the copy's own mtime
+  }
+}
@@ -6,9 +6,10 @@ export interface GitResult {
   stderr: string;
 }
 
-export function git(args: string[], cwd: string): GitResult {
+export function git(args: string[], cwd: string, input?: string): GitResult {
   const result = spawnSync('git', args, {
     cwd,
+    input,
     encoding: 'utf-8',
     maxBuffer: 10 * 1024 * 1024,
   });
@@ -70,6 +71,24 @@ export function getFileBlobHash(filePath: string, repoPath: string): string | nu
   return result.success ? result.stdout.trim() : null;
 }
 
+/**
+ * Compute git blob hashes for many files with a single `hash-object` process.
+ * Returns a map of file path to hash; empty if the batch call fails.
+ */
+export function getFileBlobHashes(filePaths: string[], repoPath: string): Map<string, string> {
+  const hashes = new Map<string, string>();
+  if (filePaths.length === 0) return hashes;
+
+  const result = git(['hash-object', '--stdin-paths'], repoPath, filePaths.join('\n') + '\n');
+  if (!result.success) return hashes;
+
+  const lines = result.stdout.split('\n');
+  if (lines.length !== filePaths.length) return hashes;
+
+  filePaths.forEach((filePath, i) => hashes.set(filePath, lines[i].trim()));
+  return hashes;
+}
+
 /**
  * Get the HEAD commit hash of a repo. Returns null if no commits exist.
  */
@@ -1,4 +1,4 @@
-import { readFileSync, existsSync, statSync } from 'fs';
+import { closeSync, existsSync, openSync, readFileSync, readSync, statSync, type BigIntStats } from 'fs';
 import { join } from 'path';
 import { minimatch, Minimatch } from 'minimatch';
 import { GitignoreFilter } from './gitignore.js';
@@ -99,23 +99,84 @@ export class Manifest {
   }
 }
 
+/** Read size used when streaming file contents for comparison. */
+const COMPARE_CHUNK_SIZE = 64 * 1024;
+
+/**
+ * Max mtime difference still treated as "same mtime". Setting times through
+ * utimes rounds through a double number of seconds, which shifts them by
+ * about a microsecond; anything further apart is compared by content.
+ */
+const MTIME_TOLERANCE_NS = 5_000n;
+
 /**
- * Compare two files byte-by-byte.
+ * Compare two files.
+ *
+ * Cheap metadata checks run first: different sizes mean different files,
+ * and equal size plus the same mtime (sync preserves source mtimes on copy)
+ * is accepted as unchanged without reading any data. mtimes are compared
+ * in nanoseconds to within MTIME_TOLERANCE_NS. Otherwise contents are
+ * streamed in fixed-size chunks, stopping at the first mismatch.
+ *
+ * Callers that already hold (bigint) stats for either file can pass them
+ * to avoid another stat call.
  */
-export function filesAreDifferent(file1: string, file2: string): boolean {
-  if (!existsSync(file1) || !existsSync(file2)) {
+export function filesAreDifferent(
+  file1: string,
+  file2: string,
+  knownStat1?: BigIntStats,
+  knownStat2?: BigIntStats
+): boolean {
+  const stat1 = knownStat1 ?? statSync(file1, { bigint: true, throwIfNoEntry: false });
+  const stat2 = knownStat2 ?? statSync(file2, { bigint: true, throwIfNoEntry: false });
+
+  if (!stat1 || !stat2) {
     return true;
   }
 
-  const stat1 = statSync(file1);
-  const stat2 = statSync(file2);
-
   if (stat1.size !== stat2.size) {
     return true;
   }
 
-  const content1 = readFileSync(file1);
-  const content2 = readFileSync(file2);
+  const mtimeDelta = stat1.mtimeNs - stat2.mtimeNs;
+  if (mtimeDelta <= MTIME_TOLERANCE_NS && mtimeDelta >= -MTIME_TOLERANCE_NS) {
+    return false;
+  }
+
+  return !contentsEqual(file1, file2);
+}
+
+function contentsEqual(file1: string, file2: string): boolean {
+  const fd1 = openSync(file1, 'r');
+  try {
+    const fd2 = openSync(file2, 'r');
+    try {
+      const buf1 = Buffer.allocUnsafe(COMPARE_CHUNK_SIZE);
+      const buf2 = Buffer.allocUnsafe(COMPARE_CHUNK_SIZE);
+      for (;;) {
+        const n1 = readChunk(fd1, buf1);
+        const n2 = readChunk(fd2, buf2);
+        if (n1 !== n2) return false;
+        if (n1 === 0) return true;
+        if (!buf1.subarray(0, n1).equals(buf2.subarray(0, n2))) return false;
+      }
+    } finally {
+      closeSync(fd2);
+    }
+  } finally {
+    closeSync(fd1);
+  }
+}
 
-  return !content1.equals(content2);
+/**
+ * Fill buf from the current file position, returning bytes read (short only at EOF).
+ */
+function readChunk(fd: number, buf: Buffer): number {
+  let total = 0;
+  while (total < buf.length) {
+    const n = readSync(fd, buf, total, buf.length - total, null);
+    if (n === 0) break;
+    total += n;
+  }
+  return total;
 }
@@ -1,6 +1,6 @@
 import { existsSync, mkdirSync, readFileSync, writeFileSync } from 'fs';
 import { dirname, join } from 'path';
-import { getFileBlobHash } from './git.js';
+import { getFileBlobHash, getFileBlobHashes } from './git.js';
 import { getHeadCommit, hasUncommittedChanges } from './git.js';
 import { SYNC_STATE_FILENAME } from './constants.js';
 
@@ -24,10 +24,16 @@ export function writeSyncState(
 ): void {
   const files: Record<string, string> = {};
 
-  for (const relPath of [...syncedFiles].sort()) {
+  const relPaths = [...syncedFiles]
+    .sort()
+    .filter((relPath) => existsSync(join(allhandsRoot, relPath)));
+
+  // Hash everything in one git process; fall back per file if the batch fails
+  const batched = getFileBlobHashes(relPaths.map((relPath) => join(allhandsRoot, relPath)), allhandsRoot);
+
+  for (const relPath of relPaths) {
     const sourceFile = join(allhandsRoot, relPath);
-    if (!existsSync(sourceFile)) continue;
-    const hash = getFileBlobHash(sourceFile, allhandsRoot);
+    const hash = batched.get(sourceFile) ?? getFileBlobHash(sourceFile, allhandsRoot);
     if (hash) {
       files[relPath] = hash;
     }